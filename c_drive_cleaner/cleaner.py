@@ -8,7 +8,7 @@ import os
 import shutil
 import ctypes
 from pathlib import Path
-from typing import Dict, List, Callable, Optional
+from typing import Dict, Iterable, List, Callable, Optional
 from dataclasses import dataclass
 
 from scanner import ScanResult
@@ -36,7 +36,8 @@ class Cleaner:
     def __init__(
         self, 
         progress_callback: Callable[[str, int, int], None] = None,
-        log_callback: Callable[[str], None] = None
+        log_callback: Callable[[str], None] = None,
+        file_iter_callback: Callable[[str], Iterable[str]] = None
     ):
         """
         初始化清理器
@@ -44,9 +45,12 @@ class Cleaner:
         Args:
             progress_callback: 进度回调函数，参数为(项目名称, 当前进度, 总进度)
             log_callback: 日志回调函数，参数为(日志信息)
+            file_iter_callback: 文件遍历回调函数，参数为(项目ID)，返回该项目匹配的全部路径，
+                用于清理路径列表被截断的项目
         """
         self.progress_callback = progress_callback
         self.log_callback = log_callback
+        self.file_iter_callback = file_iter_callback
         self._cancelled = False
     
     def _log(self, message: str):
@@ -130,15 +134,27 @@ class Cleaner:
         """
         result = CleanResult(item_id=item_id, item_name=scan_result.item_name)
         
-        # 批量更新进度，减少UI回调频率
-        update_interval = max(1, len(scan_result.files) // 100)
+        # 批量更新进度，减少UI回调频率（按完整文件数计算，路径列表可能被截断）
+        total_count = max(scan_result.file_count, len(scan_result.files))
+        update_interval = max(1, total_count // 100)
         
-        self._log(f"开始清理 {scan_result.item_name}，共 {len(scan_result.files)} 个文件")
+        self._log(f"开始清理 {scan_result.item_name}，共 {total_count} 个文件")
         
-        for index, file_path in enumerate(scan_result.files):
+        # 扫描结果只保留了部分路径时 files 只是预览，改为边遍历边删除该项目的全部文件
+        streaming = scan_result.truncated and self.file_iter_callback is not None
+        files = self.file_iter_callback(item_id) if streaming else scan_result.files
+        
+        parent_dirs = set()
+        processed = 0
+        stopped_early = False
+        for index, file_path in enumerate(files):
             if self._cancelled:
+                stopped_early = True
                 break
             
+            processed = index + 1
+            parent_dirs.add(os.path.dirname(file_path))
+            
             try:
                 if not os.path.exists(file_path):
                     continue
@@ -167,21 +183,30 @@ class Cleaner:
                 if index < 2:
                     self._log(f"  × 删除失败: {os.path.basename(file_path)}")
             
-            if progress_update and (index % update_interval == 0 or index == len(scan_result.files) - 1):
-                progress_update(index + 1)
+            if progress_update and index % update_interval == 0:
+                progress_update(min(processed, total_count))
+        
+        if progress_update and processed:
+            progress_update(min(processed, total_count))
+        
+        if stopped_early:
+            self._log(f"  已取消，{scan_result.item_name} 仍有文件未处理")
+        elif scan_result.truncated and not streaming:
+            remaining = scan_result.file_count - len(scan_result.files)
+            self._log(f"  仅清理了预览中的 {len(scan_result.files)} 个文件，另有 {remaining} 个文件未处理，请重新扫描后再清理")
+        
+        self._clean_empty_dirs(parent_dirs)
         
         from scanner import format_size
         self._log(f"完成 {scan_result.item_name}: 成功 {result.cleaned_count}，失败 {result.failed_count}，释放 {format_size(result.cleaned_size)}")
         
-        self._clean_empty_dirs(scan_result)
         return result
     
-    def _clean_empty_dirs(self, scan_result: ScanResult):
+    def _clean_empty_dirs(self, start_dirs: Iterable[str]):
         """清理空目录"""
         # 获取所有涉及的目录
         dirs = set()
-        for file_path in scan_result.files:
-            parent = os.path.dirname(file_path)
+        for parent in start_dirs:
             while parent:
                 dirs.add(parent)
                 new_parent = os.path.dirname(parent)
@@ -5,15 +5,33 @@ C盘清理工具 - 扫描模块
 """
 
 import os
+import re
+import stat
 import ctypes
-from pathlib import Path
-from typing import Dict, List, Callable, Optional
+import threading
+from collections import deque
+from typing import ClassVar, Dict, FrozenSet, Iterator, List, Callable, Optional, Pattern, Set, Tuple
 from dataclasses import dataclass, field
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 import winreg
 
 from config import CLEANUP_ITEMS, DEVELOPER_CLEAN_RULES, AGE_THRESHOLD_DAYS
 import time
 
+# 并行扫描的工作线程数
+SCAN_MAX_WORKERS = 4
+
+# 开发者深度扫描时排除的目录
+DEVELOPER_SKIP_DIRS = {
+    "windows", "program files", "program files (x86)", 
+    "programdata", "appdata", ".git", ".svn", "system volume information",
+    "$recycle.bin", "recovery", "msocache"
+}
+
+# 目录分类结果
+DIR_KIND_CLEAN = "clean"
+DIR_KIND_SKIP = "skip"
+
 
 @dataclass
 class ScanResult:
@@ -24,6 +42,73 @@ class ScanResult:
     file_count: int = 0
     files: List[str] = field(default_factory=list)
     error: Optional[str] = None
+    # files 只保留前 MAX_FILES_RETAINED 条路径，超出时置为 True；
+    # total_size / file_count 始终为完整统计
+    truncated: bool = False
+    
+    # 单个扫描结果最多保留的路径数，避免超大目录占满内存
+    MAX_FILES_RETAINED: ClassVar[int] = 10000
+    
+    def add_file(self, path: str, size: int):
+        """记录一个文件（或目录），超出保留上限时只计数不保存路径"""
+        self.total_size += size
+        self.file_count += 1
+        if len(self.files) < self.MAX_FILES_RETAINED:
+            self.files.append(path)
+        else:
+            self.truncated = True
+    
+    def add_files(self, paths: List[str], size: int, count: Optional[int] = None):
+        """
+        批量记录文件
+        
+        Args:
+            paths: 文件路径（可以只是这批文件的一部分）
+            size: 这批文件的总大小
+            count: 这批文件的总数，默认为 len(paths)
+        """
+        if count is None:
+            count = len(paths)
+        self.total_size += size
+        self.file_count += count
+        room = self.MAX_FILES_RETAINED - len(self.files)
+        self.files.extend(paths[:room])
+        if count > min(len(paths), room):
+            self.truncated = True
+    
+    def merge(self, other: "ScanResult"):
+        """合并另一个局部扫描结果"""
+        self.total_size += other.total_size
+        self.file_count += other.file_count
+        room = self.MAX_FILES_RETAINED - len(self.files)
+        self.files.extend(other.files[:room])
+        if other.truncated or len(other.files) > room:
+            self.truncated = True
+        if other.error:
+            self.error = other.error
+
+
+@dataclass(frozen=True)
+class _ScanRule:
+    """单个清理项目的文件匹配规则"""
+    item_id: str
+    extensions: Optional[FrozenSet[str]] = None
+    pattern_re: Optional[Pattern[str]] = None
+    # 模式含路径分隔符时可能跨越目录边界，需要匹配完整路径
+    spans_dirs: bool = False
+    
+    @classmethod
+    def from_item(cls, item: dict) -> "_ScanRule":
+        """根据清理项目配置构建规则，扩展名集合与正则只构建一次"""
+        extensions = item.get("extensions")
+        pattern = item.get("pattern")
+        return cls(
+            item_id=item["id"],
+            extensions=frozenset(ext.lower() for ext in extensions) if extensions else None,
+            # 忽略大小写的预编译正则，匹配时无需为每个路径生成小写副本
+            pattern_re=re.compile(re.escape(pattern), re.IGNORECASE) if pattern else None,
+            spans_dirs=bool(pattern) and ("\\" in pattern or "/" in pattern),
+        )
 
 
 class Scanner:
@@ -41,6 +126,12 @@ class Scanner:
         self.drive = drive.upper().replace("\\", "")
         self.results: Dict[str, ScanResult] = {}
         self._cancelled = False
+        # 盘符列表在一次扫描内不会变化，首次查询后缓存
+        self._drives_cache: Optional[List[str]] = None
+        
+        # 目录名 -> 分类，深度扫描时每个目录只需一次字典查找
+        self._dir_classifier: Dict[str, str] = {name: DIR_KIND_SKIP for name in DEVELOPER_SKIP_DIRS}
+        self._dir_classifier.update({name: DIR_KIND_CLEAN for name in DEVELOPER_CLEAN_RULES})
     
     @staticmethod
     def get_available_drives() -> List[str]:
@@ -55,6 +146,12 @@ class Scanner:
         except:
             return ["C:"]
 
+    def _get_drives(self) -> List[str]:
+        """获取可用驱动器（缓存结果，避免重复调用 psutil）"""
+        if self._drives_cache is None:
+            self._drives_cache = self.get_available_drives()
+        return self._drives_cache
+
     def cancel(self):
         """取消扫描"""
         self._cancelled = True
@@ -70,39 +167,85 @@ class Scanner:
         self.results.clear()
         
         total_items = len(CLEANUP_ITEMS)
+        normal_items = [item for item in CLEANUP_ITEMS if not item.get("special")]
+        special_items = [item for item in CLEANUP_ITEMS if item.get("special")]
+        results: Dict[str, ScanResult] = {}
         
-        for index, item in enumerate(CLEANUP_ITEMS):
+        # 普通项目合并为一次遍历：根目录重叠的项目（如多个项目都包含 Temp）只枚举一次
+        if normal_items:
+            results.update(self._scan_items(normal_items, progress_scale=len(normal_items) / total_items))
+        
+        for index, item in enumerate(special_items, start=len(normal_items)):
             if self._cancelled:
                 break
                 
             item_id = item["id"]
             item_name = item["name"]
             
-            # 如果不是全盘扫描，且路径不属于该盘符，可能需要跳过或重定向
-            # 但这里我们保持逻辑：如果是 ALL，则为每个盘符执行规则；如果是特定盘，则只执行该盘的规则
-            
             if self.progress_callback:
                 progress = int((index / total_items) * 100)
                 self.progress_callback(item_name, progress)
             
             # 特殊处理回收站
             if item.get("special") == "recycle_bin":
+                # 全盘时传 None，一次 SHQueryRecycleBinW 调用即可汇总所有驱动器；
+                # 不要改成逐盘查询，逐项调用 Shell API 是慢路径
                 if self.drive == "ALL":
                     result = self._scan_recycle_bin(item_id, item_name, None)
                 else:
                     result = self._scan_recycle_bin(item_id, item_name, self.drive + "\\")
-            elif item.get("special") == "developer_mode":
-                result = self._scan_developer_junk(item_id, item_name)
             else:
-                result = self._scan_item(item)
+                result = self._scan_developer_junk(item_id, item_name)
             
-            self.results[item_id] = result
+            results[item_id] = result
+        
+        # 按配置顺序保存结果
+        for item in CLEANUP_ITEMS:
+            if item["id"] in results:
+                self.results[item["id"]] = results[item["id"]]
         
         if self.progress_callback:
             self.progress_callback("扫描完成", 100)
         
         return self.results
     
+    def iter_item_files(self, item_id: str) -> Iterator[str]:
+        """
+        逐个产出清理项目匹配的全部路径，不受 MAX_FILES_RETAINED 限制
+        
+        扫描结果被截断时 files 只是预览，清理器通过此方法边遍历边删除；
+        每个目录遍历完成后才产出其中的路径，删除不会干扰正在进行的目录枚举
+        
+        Args:
+            item_id: 项目ID
+            
+        Yields:
+            匹配的文件路径（开发者项目为目录路径）
+        """
+        item = next((item for item in CLEANUP_ITEMS if item["id"] == item_id), None)
+        if not item or item.get("special") == "recycle_bin":
+            return
+        
+        if item.get("special") == "developer_mode":
+            now = time.time()
+            threshold_seconds = AGE_THRESHOLD_DAYS * 24 * 3600
+            for drive_path in self._developer_drive_paths():
+                yield from self._iter_developer_dirs(drive_path, now, threshold_seconds)
+            return
+        
+        rules_by_root, root_paths = self._collect_roots([item])
+        remaining = list(root_paths)
+        while remaining and not self._cancelled:
+            top_roots, nested_roots = self._split_roots(remaining)
+            reached = set()
+            for key in top_roots:
+                for _, batch_files, _, _ in self._walk_directory(
+                    root_paths[key], rules_by_root, nested_roots, reached
+                ):
+                    for files in batch_files:
+                        yield from files
+            remaining = [key for key in remaining if key in nested_roots and key not in reached]
+    
     def _scan_item(self, item: dict) -> ScanResult:
         """
         扫描单个清理项目
@@ -113,105 +256,346 @@ class Scanner:
         Returns:
             扫描结果
         """
-        result = ScanResult(
-            item_id=item["id"],
-            item_name=item["name"]
-        )
+        return self._scan_items([item])[item["id"]]
+    
+    def _expand_path(self, path_template: str) -> List[str]:
+        """
+        根据目标盘符展开配置中的路径
         
-        paths = item.get("paths", [])
-        extensions = item.get("extensions")
-        pattern = item.get("pattern")
+        Args:
+            path_template: 配置中的路径
+            
+        Returns:
+            实际要扫描的路径列表
+        """
+        # 处理路径盘符：如果配置是硬编码的 C:\，在扫描其他盘时需要转换
+        if not path_template.lower().startswith("c:"):
+            return [path_template]
+        if self.drive == "ALL":
+            # 对于 ALL，尝试替换为所有可用盘符
+            return [d + path_template[2:] for d in self._get_drives()]
+        # 对于特定盘，替换为目标盘符
+        return [self.drive + path_template[2:]]
+    
+    def _scan_items(self, items: List[dict], progress_scale: float = 0.0) -> Dict[str, ScanResult]:
+        """
+        一次遍历扫描多个清理项目
         
-        for path_template in paths:
-            if self._cancelled:
-                break
+        所有项目的根目录先放入以规范化路径为键的前缀表：被其他根目录包含的根目录
+        不单独遍历，而是在遍历到该目录时激活其规则，因此重叠的目录只枚举一次
+        
+        Args:
+            items: 清理项目配置列表
+            progress_scale: 本次扫描在总进度中所占比例，为 0 时不汇报进度
             
-            # 处理路径盘符：如果配置是硬编码的 C:\，在扫描其他盘时需要转换
-            target_paths = []
-            if self.drive == "ALL":
-                # 对于 ALL，如果路径包含盘符，尝试替换为所有可用盘符
-                if path_template.lower().startswith("c:"):
-                    for d in self.get_available_drives():
-                        target_paths.append(d + path_template[2:])
-                else:
-                    target_paths.append(path_template)
-            else:
-                # 对于特定盘，如果是 C:\ 开头的路径，替换为目标盘符
-                if path_template.lower().startswith("c:"):
-                    target_paths.append(self.drive + path_template[2:])
-                else:
-                    target_paths.append(path_template)
-
-            for path in target_paths:
-                if not os.path.exists(path):
-                    continue
+        Returns:
+            项目ID -> 扫描结果
+        """
+        results = {
+            item["id"]: ScanResult(item_id=item["id"], item_name=item["name"])
+            for item in items
+        }
+        
+        rules_by_root, root_paths = self._collect_roots(items)
+        
+        # 每轮以没有祖先根目录的根目录为遍历起点，其余嵌套根目录在遍历到时激活；
+        # 遍历未能到达的嵌套根目录（符号链接、中间目录无法列出、扫描被取消等）
+        # 留到下一轮作为起点单独扫描，保证每个根目录都会被扫描到
+        remaining = list(root_paths)
+        total_roots = len(remaining)
+        done_roots = 0
+        report_progress = bool(self.progress_callback and progress_scale)
+        while remaining and not self._cancelled:
+            top_roots, nested_roots = self._split_roots(remaining)
+            reached = set()
+            
+            # 互不相交的根目录并行扫描，重叠目录枚举的 I/O 等待
+            # 每个线程写入独立的局部结果，最后按提交顺序合并，无需加锁
+            with ThreadPoolExecutor(max_workers=SCAN_MAX_WORKERS) as executor:
+                futures = {
+                    executor.submit(self._scan_root, root_paths[key], rules_by_root, nested_roots, results): key
+                    for key in top_roots
+                }
+                
+                # 提交时先汇报一次，之后按完成顺序汇报进度，标签显示仍在扫描中的根目录所属项目
+                if report_progress:
+                    self._report_root_progress(futures, None, rules_by_root, results, done_roots / total_roots * progress_scale)
+                for future in as_completed(futures):
+                    done_roots = min(done_roots + 1 + len(future.result()[1]), total_roots)
+                    if report_progress:
+                        self._report_root_progress(futures, future, rules_by_root, results, done_roots / total_roots * progress_scale)
                 
-                try:
-                    self._scan_directory(
-                        path, 
-                        result, 
-                        extensions=extensions,
-                        pattern=pattern
-                    )
-                except PermissionError:
-                    result.error = "权限不足，需要管理员权限"
-                except Exception as e:
-                    result.error = str(e)
+                # 按提交顺序合并，保证文件列表顺序稳定
+                for future in futures:
+                    partials, root_reached = future.result()
+                    for item_id, partial in partials.items():
+                        results[item_id].merge(partial)
+                    reached |= root_reached
+            
+            remaining = [key for key in remaining if key in nested_roots and key not in reached]
         
-        return result
+        return results
+    
+    def _report_root_progress(
+        self,
+        futures: Dict[Future, str],
+        finished: Optional[Future],
+        rules_by_root: Dict[str, List[_ScanRule]],
+        results: Dict[str, ScanResult],
+        fraction: float
+    ):
+        """汇报根目录扫描进度，标签取第一个仍在扫描的根目录所属项目"""
+        key = next((key for future, key in futures.items() if not future.done()), None)
+        if key is None:
+            key = futures[finished] if finished is not None else next(iter(futures.values()))
+        name = results[rules_by_root[key][0].item_id].item_name
+        self.progress_callback(name, int(fraction * 100))
+    
+    def _collect_roots(self, items: List[dict]) -> Tuple[Dict[str, List[_ScanRule]], Dict[str, str]]:
+        """
+        展开并去重所有项目的根目录
+        
+        Args:
+            items: 清理项目配置列表
+            
+        Returns:
+            (规范化根路径 -> 以该目录为根的规则, 规范化根路径 -> 实际路径)，只包含存在的目录
+        """
+        rules_by_root: Dict[str, List[_ScanRule]] = {}
+        root_paths: Dict[str, str] = {}
+        # 多个项目可能展开出相同路径，存在性检查每个路径只做一次
+        exists_cache: Dict[str, bool] = {}
+        for item in items:
+            rule = _ScanRule.from_item(item)
+            for path_template in item.get("paths", []):
+                for path in self._expand_path(path_template):
+                    path = os.path.normpath(path)
+                    key = os.path.normcase(path)
+                    if key not in exists_cache:
+                        exists_cache[key] = os.path.exists(path)
+                    if not exists_cache[key]:
+                        continue
+                    if key not in root_paths:
+                        root_paths[key] = path
+                        rules_by_root[key] = []
+                    rules_by_root[key].append(rule)
+        return rules_by_root, root_paths
+    
+    @classmethod
+    def _split_roots(cls, roots: List[str]) -> Tuple[List[str], FrozenSet[str]]:
+        """
+        将根目录分为遍历起点（没有祖先根目录）与嵌套根目录
+        
+        Args:
+            roots: 规范化根路径列表
+            
+        Returns:
+            (遍历起点列表, 嵌套根目录集合)
+        """
+        roots_set = frozenset(roots)
+        top_roots = [key for key in roots if not cls._has_ancestor_root(key, roots_set)]
+        return top_roots, roots_set - frozenset(top_roots)
+    
+    @staticmethod
+    def _has_ancestor_root(key: str, roots: FrozenSet[str]) -> bool:
+        """判断规范化路径是否位于另一个根目录之下"""
+        child, parent = key, os.path.dirname(key)
+        while parent != child:
+            if parent in roots:
+                return True
+            child, parent = parent, os.path.dirname(parent)
+        return False
+    
+    def _scan_root(
+        self,
+        path: str,
+        rules_by_root: Dict[str, List[_ScanRule]],
+        nested_roots: FrozenSet[str],
+        results: Dict[str, ScanResult]
+    ) -> Tuple[Dict[str, ScanResult], Set[str]]:
+        """
+        在工作线程中扫描单个根目录
+        
+        Args:
+            path: 根目录路径（已规范化）
+            rules_by_root: 规范化根路径 -> 以该目录为根的规则
+            nested_roots: 位于其他根目录之下的根目录
+            results: 所有项目的扫描结果（仅用于取项目信息）
+            
+        Returns:
+            (项目ID -> 该根目录的局部扫描结果, 遍历中到达的嵌套根目录)
+        """
+        partials = {
+            item_id: ScanResult(item_id=item_id, item_name=result.item_name)
+            for item_id, result in results.items()
+        }
+        reached = set()
+        try:
+            self._scan_directory(path, partials, rules_by_root, nested_roots, reached)
+        except PermissionError:
+            for rule in rules_by_root[os.path.normcase(path)]:
+                partials[rule.item_id].error = "权限不足，需要管理员权限"
+        except Exception as e:
+            for rule in rules_by_root[os.path.normcase(path)]:
+                partials[rule.item_id].error = str(e)
+        return partials, reached
+    
+    @staticmethod
+    def _activate_rules(rules: List[_ScanRule], active: tuple, path: str) -> tuple:
+        """
+        在目录处激活以其为根的规则
+        
+        Args:
+            rules: 以该目录为根的规则
+            active: 当前已生效的 (规则, 待匹配模式) 元组
+            path: 目录路径
+            
+        Returns:
+            新的生效规则元组
+        """
+        active_ids = {rule.item_id for rule, _ in active}
+        added = []
+        for rule in rules:
+            # 同一项目的祖先根目录已覆盖此子树，避免重复统计
+            if rule.item_id in active_ids:
+                continue
+            active_ids.add(rule.item_id)
+            # 根目录本身已命中模式时，其下所有文件都无需再检查
+            pending = rule.pattern_re
+            if pending is not None and pending.search(path):
+                pending = None
+            added.append((rule, pending))
+        return active + tuple(added)
     
     def _scan_directory(
         self, 
         directory: str, 
-        result: ScanResult,
-        extensions: List[str] = None,
-        pattern: str = None
+        partials: Dict[str, ScanResult],
+        rules_by_root: Dict[str, List[_ScanRule]],
+        nested_roots: FrozenSet[str],
+        reached: Set[str]
     ):
         """
-        递归扫描目录
+        扫描目录，并把每个目录的匹配结果写入对应项目的扫描结果
         
         Args:
             directory: 目录路径
-            result: 扫描结果对象
-            extensions: 文件扩展名过滤
-            pattern: 路径模式匹配
+            partials: 项目ID -> 扫描结果对象
+            rules_by_root: 规范化根路径 -> 以该目录为根的规则
+            nested_roots: 位于其他根目录之下的根目录
+            reached: 记录遍历中到达的嵌套根目录
         """
-        try:
-            for entry in os.scandir(directory):
-                if self._cancelled:
-                    return
-                    
-                try:
-                    if entry.is_file(follow_symlinks=False):
-                        # 检查扩展名过滤
-                        if extensions:
-                            ext = Path(entry.path).suffix.lower()
-                            if ext not in extensions:
-                                continue
-                        
-                        # 检查模式匹配
-                        if pattern and pattern.lower() not in entry.path.lower():
-                            continue
+        for active, batch_files, batch_sizes, batch_counts in self._walk_directory(
+            directory, rules_by_root, nested_roots, reached, partials
+        ):
+            for index, (rule, _) in enumerate(active):
+                if batch_counts[index]:
+                    partials[rule.item_id].add_files(batch_files[index], batch_sizes[index], batch_counts[index])
+    
+    def _walk_directory(
+        self, 
+        directory: str, 
+        rules_by_root: Dict[str, List[_ScanRule]],
+        nested_roots: FrozenSet[str],
+        reached: Set[str],
+        partials: Optional[Dict[str, ScanResult]] = None
+    ) -> Iterator[tuple]:
+        """
+        遍历目录（使用显式栈迭代遍历，避免 Python 递归开销）
+        
+        Args:
+            directory: 目录路径
+            rules_by_root: 规范化根路径 -> 以该目录为根的规则
+            nested_roots: 位于其他根目录之下的根目录
+            reached: 记录遍历中到达的嵌套根目录
+            partials: 项目ID -> 扫描结果对象，用于限制收集的路径数；为 None 时收集全部路径
+            
+        Yields:
+            每个目录遍历完成后产出 (生效规则, 各规则的路径列表, 总大小, 文件数)
+        """
+        active = self._activate_rules(rules_by_root[os.path.normcase(directory)], (), directory)
+        
+        # 栈元素为 (目录, 生效规则)；每条规则带有待匹配模式，
+        # 祖先目录已命中模式后置为 None，子树内不再重复检查
+        stack = [(directory, active)]
+        while stack:
+            current, active = stack.pop()
+            has_pending = any(pending is not None for _, pending in active)
+            try:
+                it = os.scandir(current)
+            except (PermissionError, OSError):
+                continue
+            
+            # 每个目录先在局部变量中累计，遍历完再一次性产出；
+            # 路径只收集到保留上限为止，超大目录也不会临时堆积大量字符串
+            batch_files = [[] for _ in active]
+            batch_sizes = [0] * len(active)
+            batch_counts = [0] * len(active)
+            if partials is None:
+                batch_rooms = [float("inf")] * len(active)
+            else:
+                batch_rooms = [
+                    ScanResult.MAX_FILES_RETAINED - len(partials[rule.item_id].files)
+                    for rule, _ in active
+                ]
+            
+            with it:
+                for entry in it:
+                    if self._cancelled:
+                        break
                         
-                        size = entry.stat().st_size
-                        result.total_size += size
-                        result.file_count += 1
-                        result.files.append(entry.path)
+                    try:
+                        # 一次 stat 同时取得类型与大小（Windows 上复用目录枚举数据，不产生额外系统调用）
+                        st = entry.stat(follow_symlinks=False)
+                        name = entry.name
                         
-                    elif entry.is_dir(follow_symlinks=False):
-                        # 检查模式匹配（目录级别）
-                        if pattern and pattern.lower() not in entry.path.lower():
-                            # 继续递归，但不统计此目录下的文件
-                            self._scan_directory(entry.path, result, extensions, pattern)
-                        else:
-                            self._scan_directory(entry.path, result, extensions, None if pattern else None)
-                            
-                except (PermissionError, OSError):
-                    # 跳过无权限访问的文件
-                    continue
-                    
-        except (PermissionError, OSError):
-            pass
+                        if stat.S_ISREG(st.st_mode):
+                            ext = None
+                            for index, (rule, pending) in enumerate(active):
+                                # 先检查扩展名过滤，被过滤的文件无需匹配模式
+                                if rule.extensions:
+                                    if ext is None:
+                                        dot = name.rfind('.')
+                                        ext = name[dot:].lower() if dot > 0 else ''
+                                    if ext not in rule.extensions:
+                                        continue
+                                
+                                # 检查模式匹配：先匹配名称，仅在模式可能跨目录时才匹配完整路径
+                                if pending is not None and not pending.search(name) and (
+                                    not rule.spans_dirs or not pending.search(entry.path)
+                                ):
+                                    continue
+                                
+                                if batch_counts[index] < batch_rooms[index]:
+                                    batch_files[index].append(entry.path)
+                                batch_counts[index] += 1
+                                batch_sizes[index] += st.st_size
+                                
+                        elif stat.S_ISDIR(st.st_mode):
+                            child_active = active
+                            if has_pending:
+                                # 目录命中模式后，子树中的文件不再需要匹配
+                                child_active = tuple(
+                                    (rule, None if pending is None or pending.search(name) or (
+                                        rule.spans_dirs and pending.search(entry.path)
+                                    ) else pending)
+                                    for rule, pending in active
+                                )
+                            if nested_roots:
+                                key = os.path.normcase(entry.path)
+                                if key in nested_roots:
+                                    reached.add(key)
+                                    child_active = self._activate_rules(rules_by_root[key], child_active, entry.path)
+                            stack.append((entry.path, child_active))
+                                
+                    except (PermissionError, OSError):
+                        # 跳过无权限访问的文件
+                        continue
+            
+            yield active, batch_files, batch_sizes, batch_counts
+            
+            if self._cancelled:
+                return
     
     def _scan_recycle_bin(self, item_id: str, item_name: str, drive_path: Optional[str] = None) -> ScanResult:
         """
@@ -264,79 +648,121 @@ class Scanner:
         now = time.time()
         threshold_seconds = AGE_THRESHOLD_DAYS * 24 * 3600
         
-        # 确定扫描盘符
-        drives = self.get_available_drives() if self.drive == "ALL" else [self.drive]
+        drive_paths = self._developer_drive_paths()
+        if not drive_paths:
+            return result
         
-        # 排除目录
-        skip_dirs = {
-            "windows", "program files", "program files (x86)", 
-            "programdata", "appdata", ".git", ".svn", "system volume information",
-            "$recycle.bin", "recovery", "msocache"
-        }
-
-        for drive in drives:
-            drive_path = drive + "\\"
-            if not os.path.exists(drive_path):
-                continue
-            
-            # 限制递归深度以保证性能
-            self._depth_search(drive_path, result, now, threshold_seconds, skip_dirs, depth=0, max_depth=6)
-            
-            if self._cancelled:
-                break
+        # 每个盘符一个线程：同一卷上的目录读取会被文件系统串行化，多线程争抢反而更慢，
+        # 不同卷之间互不干扰；每个盘写入独立的局部结果后再合并
+        partials = [ScanResult(item_id=item_id, item_name=item_name) for _ in drive_paths]
+        threads = [
+            threading.Thread(
+                target=self._scan_developer_drive,
+                args=(drive_path, partial, now, threshold_seconds),
+                daemon=True
+            )
+            for drive_path, partial in zip(drive_paths, partials)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        for partial in partials:
+            result.merge(partial)
                 
         return result
 
-    def _depth_search(self, path: str, result: ScanResult, now: float, threshold: float, skip_dirs: set, depth: int, max_depth: int):
-        """递归深度搜索开发者垃圾"""
-        if self._cancelled or depth > max_depth:
-            return
-            
+    def _developer_drive_paths(self) -> List[str]:
+        """开发者深度扫描的盘符根目录"""
+        drives = self._get_drives() if self.drive == "ALL" else [self.drive]
+        return [drive + "\\" for drive in drives if os.path.exists(drive + "\\")]
+
+    def _scan_developer_drive(self, drive_path: str, result: ScanResult, now: float, threshold: float):
+        """线程入口：深度扫描单个盘符，异常记录到局部结果中，由 merge 带回"""
         try:
-            for entry in os.scandir(path):
-                if self._cancelled:
-                    return
-                
-                try:
-                    if entry.is_dir(follow_symlinks=False):
-                        name_lower = entry.name.lower()
-                        
-                        # 检查是否为目标清理目录
-                        if name_lower in DEVELOPER_CLEAN_RULES:
-                            mtime = entry.stat().st_mtime
-                            # 如果文件夹超过阈值未更新，记录
-                            if (now - mtime) > threshold:
-                                size = self._get_dir_size_for_scan(entry.path)
-                                result.total_size += size
-                                result.file_count += 1
-                                result.files.append(entry.path)
-                                # 识别到目标后，不再进入该目录深层
-                                continue
-                        
-                        # 如果不是目标目录，检查是否需要跳过并继续递归
-                        if name_lower in skip_dirs or entry.name.startswith('.'):
-                            continue
+            self._depth_search(drive_path, result, now, threshold)
+        except PermissionError:
+            result.error = "权限不足，需要管理员权限"
+        except Exception as e:
+            result.error = str(e)
+
+    def _depth_search(self, path: str, result: ScanResult, now: float, threshold: float, max_depth: int = 6):
+        """深度搜索开发者垃圾并记录目录大小"""
+        for dir_path in self._iter_developer_dirs(path, now, threshold, max_depth):
+            result.add_file(dir_path, self._get_dir_size_for_scan(dir_path))
+
+    def _iter_developer_dirs(self, path: str, now: float, threshold: float, max_depth: int = 6) -> Iterator[str]:
+        """广度优先搜索开发者垃圾目录（限制深度以保证性能）"""
+        queue = deque([(path, 0)])
+        while queue:
+            if self._cancelled:
+                return
+            current, depth = queue.popleft()
+            if depth > max_depth:
+                continue
+            
+            try:
+                it = os.scandir(current)
+            except (PermissionError, OSError):
+                continue
+            
+            # 目录枚举完成后再产出，调用方删除目录不会干扰正在进行的枚举
+            found = []
+            with it:
+                for entry in it:
+                    if self._cancelled:
+                        break
+                    
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                        if stat.S_ISDIR(st.st_mode):
+                            name_lower = entry.name.lower()
+                            
+                            # 一次字典查找完成目录分类
+                            kind = self._dir_classifier.get(name_lower)
                             
-                        self._depth_search(entry.path, result, now, threshold, skip_dirs, depth + 1, max_depth)
-                except (PermissionError, OSError):
-                    continue
-        except (PermissionError, OSError):
-            pass
+                            # 检查是否为目标清理目录
+                            if kind == DIR_KIND_CLEAN:
+                                # 如果文件夹超过阈值未更新，记录
+                                if (now - st.st_mtime) > threshold:
+                                    found.append(entry.path)
+                                    # 识别到目标后，不再进入该目录深层
+                                    continue
+                            
+                            # 如果不是目标目录，检查是否需要跳过并继续搜索
+                            if kind == DIR_KIND_SKIP or name_lower[:1] == '.':
+                                continue
+                                
+                            queue.append((entry.path, depth + 1))
+                    except (PermissionError, OSError):
+                        continue
+            
+            yield from found
 
     def _get_dir_size_for_scan(self, path: str) -> int:
-        """扫描期间专用的目录大小获取逻辑"""
+        """扫描期间专用的目录大小获取逻辑（显式栈迭代遍历）"""
         total = 0
-        try:
-            for entry in os.scandir(path):
-                try:
-                    if entry.is_file(follow_symlinks=False):
-                        total += entry.stat().st_size
-                    elif entry.is_dir(follow_symlinks=False):
-                        total += self._get_dir_size_for_scan(entry.path)
-                except (PermissionError, OSError):
-                    continue
-        except (PermissionError, OSError):
-            pass
+        stack = [path]
+        while stack:
+            if self._cancelled:
+                break
+            current = stack.pop()
+            try:
+                it = os.scandir(current)
+            except (PermissionError, OSError):
+                continue
+            
+            with it:
+                for entry in it:
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                        if stat.S_ISREG(st.st_mode):
+                            total += st.st_size
+                        elif stat.S_ISDIR(st.st_mode):
+                            stack.append(entry.path)
+                    except (PermissionError, OSError):
+                        continue
         return total
 
     def get_total_size(self) -> int:
@@ -352,6 +778,11 @@ class Scanner:
         )
 
 
+# format_size 使用的单位及小数位数，按 1024 的幂次索引
+_SIZE_UNITS = ("B", "KB", "MB", "GB")
+_SIZE_DECIMALS = (0, 1, 1, 2)
+
+
 def format_size(size_bytes: int) -> str:
     """
     格式化文件大小显示
@@ -364,9 +795,6 @@ def format_size(size_bytes: int) -> str:
     """
     if size_bytes < 1024:
         return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.1f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.1f} MB"
-    else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
+    # 用 bit_length 直接求出 1024 的幂次，代替逐级比较
+    idx = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (idx * 10)):.{_SIZE_DECIMALS[idx]}f} {_SIZE_UNITS[idx]}"
@@ -419,7 +419,8 @@ class MainWindow(ctk.CTk):
         try:
             self.cleaner = Cleaner(
                 progress_callback=self._on_clean_progress,
-                log_callback=self._log  # 将日志重定向到UI
+                log_callback=self._log,  # 将日志重定向到UI
+                file_iter_callback=self.scanner.iter_item_files if self.scanner else None
             )
             results = self.cleaner.clean(self.scan_results, selected)
             self.after(0, lambda: self._on_clean_complete(results))